@@ -1,32 +1,89 @@
 """
 Question detection module
 """
-import re
-from typing import List, Set
+from typing import List
+
+# Prefer RE2 (linear-time, DFA-based) when installed; the patterns below
+# only use syntax both engines support
+try:
+    import re2 as _re
+except ImportError:
+    import re as _re
+
+# Auxiliaries that open yes/no questions ("is it...", "can you...")
+_AUX = frozenset({
+    'is', 'are', 'was', 'were', 'do', 'does', 'did',
+    'can', 'could', 'will', 'would', 'should', 'shall',
+    'may', 'might', 'must', 'have', 'has', 'had'
+})
+
+# Question words
+_QWORDS = frozenset({
+    'what', 'when', 'where', 'who', 'whom', 'whose', 'which', 'why', 'how', 'am'
+}) | _AUX
+
+# Question patterns
+_QUESTION_PATTERNS = [
+    r'\?$',  # Ends with question mark
+    r'^(what|when|where|who|whom|whose|which|why|how)\s+',  # Starts with question word
+    r'^(is|are|was|were|do|does|did|can|could|will|would|should)\s+',  # Starts with auxiliary
+    r'^(tell me|explain|describe|define|calculate|solve)\s+',  # Command-like questions
+    r'(what|how|why|when|where)\s+.*\?*$',  # Contains question word
+]
+
+# Compiled once at import as a single alternation so one search covers every pattern
+_COMBINED_QUESTION_RE = _re.compile(
+    '(?i)' + '|'.join(f'(?:{pattern})' for pattern in _QUESTION_PATTERNS)
+)
+
+# Maps every sentence delimiter to '.' so extract_questions can use str.split
+_DELIM_MAP = str.maketrans('!?', '..')
+
+# First letters of every question word, auxiliary and command, used to
+# reject most non-questions before running the regex
+_QUESTION_FIRST_CHARS = frozenset('wiadcshmte')
+
+# Prefix groups for get_question_type
+_QUESTION_WORD_PREFIXES = ('what', 'when', 'where', 'who', 'whom', 'whose', 'which', 'why', 'how')
+_EXPLAIN_PREFIXES = ('tell me', 'explain', 'describe', 'define')
+_CALC_PREFIXES = ('calculate', 'solve', 'compute')
+
+# First word -> question type, so most questions categorize with one lookup
+_QUESTION_TYPES = {w: w for w in _QUESTION_WORD_PREFIXES}
+_QUESTION_TYPES.update({w: 'yes/no' for w in _AUX})
+_QUESTION_TYPES.update({w: 'explanation' for w in ('explain', 'describe', 'define')})
+_QUESTION_TYPES.update({w: 'calculation' for w in _CALC_PREFIXES})
+
+def _classify(question_lower: str) -> str:
+    """Categorize an already lowercased and stripped question"""
+    first_word = question_lower.split(None, 1)[0] if question_lower else ''
+    
+    question_type = _QUESTION_TYPES.get(first_word)
+    if question_type:
+        return question_type
+    
+    # Fall back to prefix checks for contractions ("what's") and
+    # multi-word commands ("tell me")
+    if question_lower.startswith(_QUESTION_WORD_PREFIXES):
+        # Shortest prefix first, e.g. "who's" reports 'who'
+        for length in (3, 4, 5):
+            if question_lower[:length] in _QUESTION_WORD_PREFIXES:
+                return question_lower[:length]
+    
+    if question_lower.startswith(_EXPLAIN_PREFIXES):
+        return 'explanation'
+    
+    if question_lower.startswith(_CALC_PREFIXES):
+        return 'calculation'
+    
+    return 'other'
 
 class QuestionDetector:
     """Detects questions in transcribed text"""
     
     def __init__(self):
         # Question words
-        self.question_words = {
-            'what', 'when', 'where', 'who', 'whom', 'whose', 'which', 'why', 'how',
-            'is', 'are', 'was', 'were', 'do', 'does', 'did', 'can', 'could', 
-            'will', 'would', 'should', 'shall', 'may', 'might', 'must',
-            'am', 'has', 'have', 'had'
-        }
-        
-        # Question patterns
-        self.question_patterns = [
-            r'\?$',  # Ends with question mark
-            r'^(what|when|where|who|whom|whose|which|why|how)\s+',  # Starts with question word
-            r'^(is|are|was|were|do|does|did|can|could|will|would|should)\s+',  # Starts with auxiliary
-            r'^(tell me|explain|describe|define|calculate|solve)\s+',  # Command-like questions
-            r'(what|how|why|when|where)\s+.*\?*$',  # Contains question word
-        ]
-        
-        # Compile patterns for efficiency
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.question_patterns]
+        self.question_words = _QWORDS
     
     def is_question(self, text: str) -> bool:
         """
@@ -47,25 +104,23 @@ class QuestionDetector:
         if text.endswith('?'):
             return True
         
-        # Check patterns
-        for pattern in self.compiled_patterns:
-            if pattern.search(text):
-                return True
+        lower_text = text.lower()
         
-        # Check if starts with question word
-        first_word = text.split()[0].lower()
-        if first_word in self.question_words:
-            return True
+        # Fast rejection: the remaining checks need a question word at the
+        # start or one of what/why/when/where/how somewhere in the text
+        if (lower_text[0] not in _QUESTION_FIRST_CHARS
+                and 'wh' not in lower_text and 'how' not in lower_text):
+            return False
         
-        # Check for inverted sentence structure (auxiliary before subject)
-        words = text.lower().split()
-        if len(words) >= 2:
-            if words[0] in {'is', 'are', 'was', 'were', 'do', 'does', 'did', 
-                           'can', 'could', 'will', 'would', 'should', 'shall',
-                           'may', 'might', 'must', 'have', 'has', 'had'}:
-                return True
+        # Check patterns
+        if _COMBINED_QUESTION_RE.search(lower_text):
+            return True
         
-        return False
+        # Check if starts with question word; this also covers inverted
+        # sentence structure since every auxiliary is in question_words
+        words = lower_text.split()
+        first_word = words[0] if words else ''
+        return first_word in self.question_words
     
     def extract_questions(self, text: str) -> List[str]:
         """
@@ -79,8 +134,9 @@ class QuestionDetector:
         """
         questions = []
         
-        # Split by common sentence delimiters
-        sentences = re.split(r'[.!?]+', text)
+        # Split by common sentence delimiters; runs of delimiters leave
+        # empty pieces, which are skipped below
+        sentences = text.translate(_DELIM_MAP).split('.')
         
         for sentence in sentences:
             sentence = sentence.strip()
@@ -102,27 +158,4 @@ class QuestionDetector:
         Returns:
             Type of question (e.g., 'what', 'how', 'yes/no', etc.)
         """
-        question_lower = question.lower().strip()
-        
-        # Check for specific question words
-        for q_word in ['what', 'when', 'where', 'who', 'whom', 'whose', 'which', 'why', 'how']:
-            if question_lower.startswith(q_word):
-                return q_word
-        
-        # Check for yes/no questions
-        yes_no_starters = {'is', 'are', 'was', 'were', 'do', 'does', 'did', 
-                          'can', 'could', 'will', 'would', 'should', 'shall',
-                          'may', 'might', 'must', 'have', 'has', 'had'}
-        
-        first_word = question_lower.split()[0] if question_lower.split() else ''
-        if first_word in yes_no_starters:
-            return 'yes/no'
-        
-        # Check for command-like questions
-        if any(question_lower.startswith(cmd) for cmd in ['tell me', 'explain', 'describe', 'define']):
-            return 'explanation'
-        
-        if any(question_lower.startswith(cmd) for cmd in ['calculate', 'solve', 'compute']):
-            return 'calculation'
-        
-        return 'other'
+        return _classify(question.lower().strip())
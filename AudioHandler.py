@@ -1,71 +1,164 @@
 """
 Audio handler for continuous listening and transcription
 """
-import speech_recognition as sr
-from PyQt6.QtCore import QThread, pyqtSignal
-import queue
-import numpy as np
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# speech_recognition and faster_whisper are imported where they are used,
+# so loading this module (and showing the window) stays fast
+
+# Optional voice activity detection used to skip silent phrases
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_BYTES = 960  # 30 ms of 16-bit mono audio at 16 kHz
+VAD_SPEECH_RATIO = 0.2  # Minimum fraction of speech frames worth transcribing
+
+AUDIO_BUFFER_SIZE = 16  # Phrases kept while transcription catches up; oldest are dropped
+
+AMBIENT_CACHE_FILE = os.path.join("cache", "ambient.json")
+AMBIENT_CACHE_MAX_AGE = 10 * 60  # Seconds before the saved calibration is redone
 
 class AudioListenerThread(QThread):
     """Thread for continuous audio listening"""
     transcription_ready = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
+    failed = pyqtSignal(str)  # listening could not start; the thread has exited
     
-    def __init__(self):
+    # Shared across thread restarts so the model is only loaded once
+    _whisper_model = None
+    _whisper_lock = threading.Lock()
+    
+    def __init__(self, recognizer, microphone, mic_lock):
         super().__init__()
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.audio_queue = queue.Queue()
+        self.whisper_model = None
+        self.use_whisper = os.getenv("STT_ENGINE", "whisper").lower() == "whisper"
+        self.vad = webrtcvad.Vad(2) if webrtcvad else None
+        
+        self.recognizer = recognizer
+        self.microphone = microphone
+        self.mic_lock = mic_lock
+        self.audio_buffer = deque(maxlen=AUDIO_BUFFER_SIZE)
+        self.audio_event = threading.Event()
         self.is_running = False
         self.is_visualization_mode = False
-        
-        # Adjust recognizer settings for better performance
-        self.recognizer.energy_threshold = 4000
-        self.recognizer.dynamic_energy_threshold = True
-        self.recognizer.dynamic_energy_adjustment_damping = 0.15
-        self.recognizer.dynamic_energy_ratio = 1.5
-        self.recognizer.pause_threshold = 0.8
-        self.recognizer.operation_timeout = None
-        self.recognizer.phrase_threshold = 0.3
-        self.recognizer.non_speaking_duration = 0.5
     
     def run(self):
         """Main thread loop"""
         self.is_running = True
         
-        with self.microphone as source:
-            # Adjust for ambient noise
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            
-        # Start background listening
-        self.stop_listening = self.recognizer.listen_in_background(
-            self.microphone, 
-            self.audio_callback,
-            phrase_time_limit=None
-        )
+        if self.use_whisper:
+            try:
+                self.whisper_model = self.load_whisper_model()
+            except ImportError:
+                # faster-whisper not installed, use Google
+                pass
+            except Exception as e:
+                self.error_occurred.emit(f"Could not load Whisper model, using Google: {str(e)}")
         
-        # Process audio queue
-        while self.is_running:
+        # Wait for the shared microphone, giving up if stopped meanwhile so
+        # stop() never blocks on a thread that is still waiting for it
+        while not self.mic_lock.acquire(timeout=0.5):
+            if not self.is_running:
+                return
+        
+        # Hold the microphone until the loop ends
+        try:
             try:
-                audio = self.audio_queue.get(timeout=0.5)
-                self.process_audio(audio)
-            except queue.Empty:
-                continue
+                # Start background listening
+                self.stop_listening = self.recognizer.listen_in_background(
+                    self.microphone, 
+                    self.audio_callback,
+                    phrase_time_limit=None
+                )
             except Exception as e:
-                self.error_occurred.emit(f"Error processing audio: {str(e)}")
+                self.failed.emit(f"Could not open microphone: {str(e)}")
+                return
+            
+            try:
+                # Process buffered audio
+                while self.is_running:
+                    if not self.audio_event.wait(0.5):
+                        continue
+                    self.audio_event.clear()
+                    
+                    # Recheck after every phrase so stop() is not held up
+                    # by a backlog of transcriptions
+                    while self.is_running and self.audio_buffer:
+                        try:
+                            audio = self.audio_buffer.popleft()
+                            self.process_audio(audio)
+                        except Exception as e:
+                            self.error_occurred.emit(f"Error processing audio: {str(e)}")
+            finally:
+                # Wait for the background listener to close the microphone
+                # before handing it over
+                self.stop_listening(wait_for_stop=True)
+        finally:
+            self.mic_lock.release()
     
     def audio_callback(self, recognizer, audio):
         """Callback for background listening"""
         try:
-            self.audio_queue.put(audio)
+            self.audio_buffer.append(audio)
+            self.audio_event.set()
         except Exception as e:
             self.error_occurred.emit(f"Error in audio callback: {str(e)}")
     
+    @classmethod
+    def load_whisper_model(cls):
+        """Load the local Whisper model on first use"""
+        with cls._whisper_lock:
+            if cls._whisper_model is None:
+                from faster_whisper import WhisperModel
+                cls._whisper_model = WhisperModel('small.en', device='cpu', compute_type='int8')
+            return cls._whisper_model
+    
+    def transcribe(self, audio) -> str:
+        """Transcribe locally with Whisper, or with Google as the fallback"""
+        if self.whisper_model is None:
+            # Google Speech Recognition (free, no API key needed)
+            return self.recognizer.recognize_google(audio)
+        
+        import numpy as np
+        raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        pcm = np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+        segments, _ = self.whisper_model.transcribe(pcm, vad_filter=True, beam_size=1)
+        return ''.join(segment.text for segment in segments).strip()
+    
+    def contains_speech(self, audio) -> bool:
+        """Check whether enough 30 ms frames of the phrase contain speech"""
+        if self.vad is None:
+            return True
+        
+        raw = audio.get_raw_data(convert_rate=VAD_SAMPLE_RATE, convert_width=2)
+        frame_count = len(raw) // VAD_FRAME_BYTES
+        if frame_count == 0:
+            return False
+        
+        speech_frames = sum(
+            1 for i in range(frame_count)
+            if self.vad.is_speech(raw[i * VAD_FRAME_BYTES:(i + 1) * VAD_FRAME_BYTES], VAD_SAMPLE_RATE)
+        )
+        return speech_frames >= frame_count * VAD_SPEECH_RATIO
+    
     def process_audio(self, audio):
         """Process audio and transcribe"""
+        import speech_recognition as sr
+        
         try:
-            # Try Google Speech Recognition first (free, no API key needed)
-            text = self.recognizer.recognize_google(audio)
+            # Skip ambient noise that would only come back as UnknownValueError
+            if not self.contains_speech(audio):
+                return
+            
+            text = self.transcribe(audio)
             
             if text:
                 self.transcription_ready.emit(text)
@@ -79,101 +172,192 @@ class AudioListenerThread(QThread):
             self.error_occurred.emit(f"Unexpected error: {str(e)}")
     
     def stop(self):
-        """Stop the thread"""
+        """
+        Ask the thread to stop without waiting for it
+        
+        The background listener only returns once the speaker pauses, so
+        waiting here would freeze the UI; mic_lock already keeps the next
+        thread off the microphone until this one has released it.
+        """
         self.is_running = False
-        if hasattr(self, 'stop_listening'):
-            self.stop_listening(wait_for_stop=False)
-        self.wait()
 
 class VisualizationListenerThread(QThread):
     """Thread for visualization mode listening"""
     visualization_request = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     
-    def __init__(self):
+    def __init__(self, recognizer, microphone, mic_lock):
         super().__init__()
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.recognizer = recognizer
+        self.microphone = microphone
+        self.mic_lock = mic_lock
         self.is_running = False
         self.is_recording = False
+        self._record_event = threading.Event()
     
     def run(self):
         """Main thread loop for visualization"""
+        import speech_recognition as sr
+        
         self.is_running = True
         
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            
+        with self.mic_lock, self.microphone as source:
             while self.is_running:
-                if self.is_recording:
-                    try:
-                        # Listen until silence
-                        audio = self.recognizer.listen(
-                            source,
-                            timeout=None,
-                            phrase_time_limit=10
-                        )
-                        
-                        # Transcribe
-                        text = self.recognizer.recognize_google(audio)
-                        if text:
-                            self.visualization_request.emit(text)
-                        
-                        self.is_recording = False
-                        
-                    except sr.WaitTimeoutError:
-                        pass
-                    except Exception as e:
-                        self.error_occurred.emit(f"Visualization error: {str(e)}")
-                        self.is_recording = False
-                else:
-                    self.msleep(100)
+                if not self.is_recording:
+                    # Sleep until start_recording() or stop() wakes us
+                    self._record_event.wait()
+                    self._record_event.clear()
+                    continue
+                
+                try:
+                    # Listen until silence; the timeout lets a stopped thread
+                    # give the microphone back when nobody is speaking
+                    audio = self.recognizer.listen(
+                        source,
+                        timeout=1,
+                        phrase_time_limit=10
+                    )
+                    
+                    # Transcribe
+                    text = self.recognizer.recognize_google(audio)
+                    if text:
+                        self.visualization_request.emit(text)
+                    
+                    self.is_recording = False
+                    
+                except sr.WaitTimeoutError:
+                    pass
+                except Exception as e:
+                    self.error_occurred.emit(f"Visualization error: {str(e)}")
+                    self.is_recording = False
     
     def start_recording(self):
         """Start recording for visualization"""
         self.is_recording = True
+        self._record_event.set()
     
     def stop_recording(self):
         """Stop recording"""
         self.is_recording = False
     
     def stop(self):
-        """Stop the thread"""
+        """Ask the thread to stop without waiting for it"""
         self.is_running = False
         self.is_recording = False
-        self.wait()
+        self._record_event.set()
 
-class AudioHandler:
+class AudioHandler(QObject):
     """Main audio handler class"""
+    # Forwarded from the listener threads
+    transcription_ready = pyqtSignal(str)
+    visualization_request = pyqtSignal(str)
+    error_occurred = pyqtSignal(str)
+    listening_failed = pyqtSignal(str)
+    
     def __init__(self):
+        super().__init__()
         self.listener_thread = None
         self.viz_thread = None
-        self.transcription_ready = None
-        self.visualization_request = None
+        self.resume_listening = False
+        
+        # Threads told to stop, kept referenced until they have finished
+        self.stopping_threads = []
+        
+        # One recognizer and microphone shared by both listener threads;
+        # mic_lock ensures only one of them has the microphone open
+        import speech_recognition as sr
+        self.recognizer = sr.Recognizer()
+        self.microphone = sr.Microphone()
+        self.mic_lock = threading.Lock()
+        
+        # Adjust recognizer settings for better performance
+        self.recognizer.energy_threshold = 4000
+        self.recognizer.dynamic_energy_threshold = True
+        self.recognizer.dynamic_energy_adjustment_damping = 0.15
+        self.recognizer.dynamic_energy_ratio = 1.5
+        self.recognizer.pause_threshold = 0.8
+        self.recognizer.operation_timeout = None
+        self.recognizer.phrase_threshold = 0.3
+        self.recognizer.non_speaking_duration = 0.5
+        
+        # Calibrate in the background; listeners wait on mic_lock if needed
+        threading.Thread(target=self.calibrate, daemon=True).start()
+    
+    def calibrate(self):
+        """Adjust for ambient noise, reusing a recent saved calibration"""
+        try:
+            with open(AMBIENT_CACHE_FILE) as f:
+                saved = json.load(f)
+            if time.time() - saved['ts'] < AMBIENT_CACHE_MAX_AGE:
+                self.recognizer.energy_threshold = saved['energy_threshold']
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        with self.mic_lock, self.microphone as source:
+            # Adjust for ambient noise
+            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        
+        try:
+            os.makedirs(os.path.dirname(AMBIENT_CACHE_FILE), exist_ok=True)
+            with open(AMBIENT_CACHE_FILE, 'w') as f:
+                json.dump({'energy_threshold': self.recognizer.energy_threshold, 'ts': time.time()}, f)
+        except OSError:
+            pass
     
     def start_listening(self):
         """Start continuous listening"""
         if not self.listener_thread or not self.listener_thread.isRunning():
-            self.listener_thread = AudioListenerThread()
-            if self.transcription_ready:
-                self.listener_thread.transcription_ready.connect(self.transcription_ready)
+            self.listener_thread = AudioListenerThread(self.recognizer, self.microphone, self.mic_lock)
+            self.listener_thread.transcription_ready.connect(self.transcription_ready)
+            self.listener_thread.error_occurred.connect(self.error_occurred)
+            self.listener_thread.failed.connect(self.listening_failed)
             self.listener_thread.start()
     
     def stop_listening(self):
         """Stop listening"""
-        if self.listener_thread and self.listener_thread.isRunning():
-            self.listener_thread.stop()
+        self.resume_listening = False
+        if self.listener_thread:
+            self._retire(self.listener_thread)
+            self.listener_thread = None
     
     def start_visualization_mode(self):
         """Start visualization mode"""
         if not self.viz_thread or not self.viz_thread.isRunning():
-            self.viz_thread = VisualizationListenerThread()
-            if self.visualization_request:
-                self.viz_thread.visualization_request.connect(self.visualization_request)
+            # Pause continuous listening so visualization can take the microphone
+            was_listening = bool(self.listener_thread and self.listener_thread.isRunning())
+            self.stop_listening()
+            self.resume_listening = was_listening
+            
+            self.viz_thread = VisualizationListenerThread(self.recognizer, self.microphone, self.mic_lock)
+            self.viz_thread.visualization_request.connect(self.visualization_request)
+            self.viz_thread.error_occurred.connect(self.error_occurred)
             self.viz_thread.start()
             self.viz_thread.start_recording()
     
     def stop_visualization_mode(self):
         """Stop visualization mode"""
-        if self.viz_thread and self.viz_thread.isRunning():
-            self.viz_thread.stop()
+        if self.viz_thread:
+            self._retire(self.viz_thread)
+            self.viz_thread = None
+        
+        if self.resume_listening:
+            self.resume_listening = False
+            self.start_listening()
+    
+    def shutdown(self):
+        """Stop all listening and wait for the threads to exit"""
+        self.stop_listening()
+        if self.viz_thread:
+            self._retire(self.viz_thread)
+            self.viz_thread = None
+        
+        for thread in self.stopping_threads:
+            thread.wait()
+        self.stopping_threads.clear()
+    
+    def _retire(self, thread):
+        """Stop a thread without blocking; it hands the microphone over through mic_lock"""
+        thread.stop()
+        self.stopping_threads = [t for t in self.stopping_threads if t.isRunning()]
+        self.stopping_threads.append(thread)
@@ -1,81 +1,143 @@
 """
 Language Model handler for answering questions
 """
-from PyQt6.QtCore import QThread, pyqtSignal
-import openai
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
 import os
+import queue
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Optional
 from dotenv import load_dotenv
 
+# Optional persistent backing for the answer cache
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
 # Load environment variables
 load_dotenv()
 
-class LLMThread(QThread):
-    """Thread for LLM API calls"""
-    answer_ready = pyqtSignal(str)
+def _cache_key(subject: str, question: str) -> bytes:
+    """Hash the subject and normalized question into a cache key"""
+    normalized = " ".join(question.lower().split())
+    text = f"{subject}|{normalized}"
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+class LLMWorkerThread(QThread):
+    """Persistent thread serving all LLM API calls from a request queue"""
+    answer_ready = pyqtSignal(str, str)  # question, streamed answer text one chunk at a time
+    answer_complete = pyqtSignal(str, str)  # question, full answer once the stream ends
+    answer_failed = pyqtSignal(str, str)  # question, error message; ends the stream
+    question_answered = pyqtSignal(str, str, str)  # subject, question, answer
+    visualization_ready = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, question: str, subject: str, api_key: str):
+    def __init__(self, api_key: str, disk_cache=None, semantic_cache=None):
         super().__init__()
-        self.question = question
-        self.subject = subject
         self.api_key = api_key
+        self.disk_cache = disk_cache
+        self.semantic_cache = semantic_cache
+        self.requests = queue.Queue()
+        self.is_running = False
+    
+    def submit(self, kind: str, prompt: str, system_prompt: str, subject: str):
+        """Queue a request; kind is 'answer' or 'visualization'"""
+        self.requests.put((kind, prompt, system_prompt, subject))
     
     def run(self):
+        """Main thread loop"""
+        # Imported on the worker thread so loading the module stays cheap
+        import openai
+        
+        self.is_running = True
+        
+        # Configured once; openai keeps its HTTP session per thread, so a
+        # long-lived worker reuses the same connection across requests
+        openai.api_key = self.api_key
+        
+        while self.is_running:
+            try:
+                kind, prompt, system_prompt, subject = self.requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            if kind == 'visualization':
+                self.process_visualization(prompt, system_prompt)
+            else:
+                self.process_question(prompt, system_prompt, subject)
+    
+    def process_question(self, question: str, system_prompt: str, subject: str):
         """Run LLM query"""
+        cached = self.cached_answer(question, subject)
+        if cached is not None:
+            self.answer_ready.emit(question, cached)
+            self.answer_complete.emit(question, cached)
+            self.question_answered.emit(subject, question, cached)
+            return
+        
+        import openai
+        
         try:
-            # Set up OpenAI client
-            openai.api_key = self.api_key
-            
-            # Create the prompt with subject context
-            system_prompt = f"""You are a helpful educational assistant specializing in {self.subject}. 
-            Answer questions clearly and concisely, providing accurate information relevant to the subject.
-            Keep answers educational but easy to understand."""
-            
-            # Make API call
+            # Make API call, streaming so the first words show up right away
             response = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",  # You can change to "gpt-4" if you have access
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": self.question}
+                    {"role": "user", "content": question}
                 ],
                 max_tokens=500,
-                temperature=0.7
+                temperature=0.7,
+                stream=True
             )
             
-            answer = response.choices[0].message['content'].strip()
-            self.answer_ready.emit(answer)
+            chunks = []
+            for chunk in response:
+                # Abandon the stream when stop() is waiting on this thread
+                if not self.is_running:
+                    return
+                delta = chunk.choices[0].delta.get('content', '')
+                if delta:
+                    chunks.append(delta)
+                    self.answer_ready.emit(question, delta)
+            
+            answer = ''.join(chunks).strip()
+            self.answer_complete.emit(question, answer)
+            if self.disk_cache is not None:
+                self.disk_cache.set(_cache_key(subject, question), answer)
+            if self.semantic_cache is not None:
+                self.semantic_cache.put(question, answer, subject)
+            self.question_answered.emit(subject, question, answer)
             
         except Exception as e:
-            self.error_occurred.emit(f"LLM Error: {str(e)}")
-
-class VisualizationThread(QThread):
-    """Thread for visualization requests"""
-    visualization_ready = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
+            self.answer_failed.emit(question, f"LLM Error: {str(e)}")
     
-    def __init__(self, request: str, subject: str, api_key: str):
-        super().__init__()
-        self.request = request
-        self.subject = subject
-        self.api_key = api_key
+    def cached_answer(self, question: str, subject: str) -> Optional[str]:
+        """
+        Look up an earlier answer on disk, then one to a question with the
+        same meaning; both run here so the UI thread never waits on disk or
+        on embedding the question
+        """
+        if self.disk_cache is not None:
+            answer = self.disk_cache.get(_cache_key(subject, question))
+            if answer is not None:
+                return answer
+        
+        if self.semantic_cache is not None:
+            return self.semantic_cache.get(question, subject)
+        return None
     
-    def run(self):
+    def process_visualization(self, request: str, system_prompt: str):
         """Process visualization request"""
+        import openai
+        
         try:
-            openai.api_key = self.api_key
-            
-            # Create visualization prompt
-            system_prompt = f"""You are a visualization assistant for {self.subject}.
-            When asked to visualize something, provide a detailed description of what the visualization would show.
-            If possible, provide ASCII art or text-based diagrams.
-            For mathematical functions, describe the graph characteristics."""
-            
             response = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Visualize: {self.request}"}
+                    {"role": "user", "content": f"Visualize: {request}"}
                 ],
                 max_tokens=800,
                 temperature=0.5
@@ -86,14 +148,33 @@ class VisualizationThread(QThread):
             
         except Exception as e:
             self.error_occurred.emit(f"Visualization Error: {str(e)}")
+    
+    def stop(self):
+        """Stop the thread"""
+        self.is_running = False
+        self.wait()
 
-class LLMHandler:
+class LLMHandler(QObject):
     """Main LLM handler class"""
-    def __init__(self):
+    # Forwarded from the worker thread, or emitted directly for cached
+    # answers; answers carry the question they belong to
+    answer_ready = pyqtSignal(str, str)
+    answer_complete = pyqtSignal(str, str)
+    answer_failed = pyqtSignal(str, str)
+    visualization_ready = pyqtSignal(str)
+    
+    def __init__(self, cache_size: int = 128, semantic_cache=None):
+        super().__init__()
+        self.semantic_cache = semantic_cache
         self.api_key = None
         self.subject = "General"
-        self.answer_ready = None
-        self.visualization_ready = None
+        self.worker_thread = None
+        
+        # LRU answer cache keyed on (subject, normalized question)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._disk_cache = diskcache.Cache(os.path.join("cache", "llm")) if diskcache else None
         
         # Try to get API key from environment
         self.api_key = os.getenv("OPENAI_API_KEY")
@@ -101,41 +182,108 @@ class LLMHandler:
         if not self.api_key:
             print("WARNING: OPENAI_API_KEY not found in environment variables.")
             print("Please create a .env file with your API key.")
+        
+        self.set_subject(self.subject)
     
     def set_subject(self, subject: str):
         """Set the subject for context"""
         self.subject = subject
+        
+        # Build the system prompts once per subject rather than per request
+        self._answer_sys = f"""You are a helpful educational assistant specializing in {subject}. 
+            Answer questions clearly and concisely, providing accurate information relevant to the subject.
+            Keep answers educational but easy to understand."""
+        
+        self._viz_sys = f"""You are a visualization assistant for {subject}.
+            When asked to visualize something, provide a detailed description of what the visualization would show.
+            If possible, provide ASCII art or text-based diagrams.
+            For mathematical functions, describe the graph characteristics."""
+    
+    def set_semantic_cache(self, semantic_cache):
+        """Attach the semantic cache once it has loaded"""
+        self.semantic_cache = semantic_cache
+        if self.worker_thread:
+            self.worker_thread.semantic_cache = semantic_cache
     
     def get_answer(self, question: str):
         """Get answer to a question"""
         if not self.api_key:
-            if self.answer_ready:
-                self.answer_ready.emit("Error: OpenAI API key not configured. Please set your API key in the .env file.")
+            self._emit_full_answer(question, "Error: OpenAI API key not configured. Please set your API key in the .env file.")
+            return
+        
+        cached = self._get_cached_answer(self.subject, question)
+        if cached is not None:
+            self._emit_full_answer(question, cached)
             return
         
-        thread = LLMThread(question, self.subject, self.api_key)
-        if self.answer_ready:
-            thread.answer_ready.connect(self.answer_ready)
-        thread.start()
+        self._ensure_worker()
+        self.worker_thread.submit('answer', question, self._answer_sys, self.subject)
     
     def get_visualization(self, request: str):
         """Get visualization for a request"""
         if not self.api_key:
-            if self.visualization_ready:
-                self.visualization_ready.emit("Error: OpenAI API key not configured.")
+            self.visualization_ready.emit("Error: OpenAI API key not configured.")
             return
         
-        thread = VisualizationThread(request, self.subject, self.api_key)
-        if self.visualization_ready:
-            thread.visualization_ready.connect(self.visualization_ready)
-        thread.start()
+        self._ensure_worker()
+        self.worker_thread.submit('visualization', request, self._viz_sys, self.subject)
+    
+    def _ensure_worker(self):
+        """Start the shared worker thread on first use"""
+        if not self.worker_thread or not self.worker_thread.isRunning():
+            self.worker_thread = LLMWorkerThread(self.api_key, self._disk_cache, self.semantic_cache)
+            self.worker_thread.answer_ready.connect(self.answer_ready)
+            self.worker_thread.answer_complete.connect(self.answer_complete)
+            self.worker_thread.answer_failed.connect(self.answer_failed)
+            self.worker_thread.question_answered.connect(self._store_answer)
+            self.worker_thread.visualization_ready.connect(self.visualization_ready)
+            self.worker_thread.start()
+    
+    def _emit_full_answer(self, question: str, answer: str):
+        """Deliver a complete answer as a single chunk followed by completion"""
+        self.answer_ready.emit(question, answer)
+        self.answer_complete.emit(question, answer)
+    
+    def stop(self):
+        """Stop the worker thread"""
+        if self.worker_thread and self.worker_thread.isRunning():
+            self.worker_thread.stop()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+    
+    def _get_cached_answer(self, subject: str, question: str) -> Optional[str]:
+        """Look up a previous answer in memory; the worker checks disk"""
+        key = _cache_key(subject, question)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+    
+    def _store_answer(self, subject: str, question: str, answer: str):
+        """Remember an answer in memory; the worker has already written it to disk"""
+        self._remember(_cache_key(subject, question), answer)
+    
+    def _remember(self, key: bytes, answer: str):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        with self._cache_lock:
+            self._cache[key] = answer
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
 # Alternative LLM Handler using Hugging Face (free alternative)
-class HuggingFaceLLMHandler:
+class HuggingFaceLLMHandler(QObject):
     """Alternative handler using Hugging Face models (free)"""
+    # Same signals as LLMHandler, so the window can use either
+    answer_ready = pyqtSignal(str, str)
+    answer_complete = pyqtSignal(str, str)
+    answer_failed = pyqtSignal(str, str)
+    visualization_ready = pyqtSignal(str)
+    
     def __init__(self):
+        super().__init__()
         self.subject = "General"
-        self.answer_ready = None
         
         # Note: This would require transformers library
         # from transformers import pipeline
@@ -145,12 +293,19 @@ class HuggingFaceLLMHandler:
         """Set the subject for context"""
         self.subject = subject
     
+    def set_semantic_cache(self, semantic_cache):
+        """Semantic caching is not supported by this handler"""
+    
     def get_answer(self, question: str):
         """Get answer using local model"""
         # TODO: Implement Hugging Face integration
         # This is a placeholder for local model integration
-        if self.answer_ready:
-            self.answer_ready.emit(
-                "Hugging Face integration not yet implemented. "
-                "Please configure OpenAI API key for now."
-            )
+        answer = (
+            "Hugging Face integration not yet implemented. "
+            "Please configure OpenAI API key for now."
+        )
+        self.answer_ready.emit(question, answer)
+        self.answer_complete.emit(question, answer)
+    
+    def stop(self):
+        """Nothing to stop; answers are produced synchronously"""
@@ -4,7 +4,7 @@ Main application entry point for the Audio Q&A Assistant
 import sys
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
-from ui.main_window import MainWindow
+from ui.main_window import MainWindow, APP_STYLESHEET
 
 def main():
     # Enable high DPI scaling
@@ -17,6 +17,7 @@ def main():
     
     # Set application style
     app.setStyle('Fusion')
+    app.setStyleSheet(APP_STYLESHEET)
     
     # Create and show main window
     window = MainWindow()
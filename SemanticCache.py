@@ -0,0 +1,189 @@
+"""
+Semantic cache for answers to previously asked questions
+"""
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+# numpy, sentence_transformers and faiss are imported when the cache is
+# built, on the handler loader thread, so importing this module stays cheap
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+CACHE_DB = os.path.join("cache", "semantic_cache.db")
+
+class SemanticCache:
+    """
+    Returns stored answers for questions that mean the same thing
+    
+    Exact repeats are served by LLMHandler's own cache before a question
+    reaches this one. get() and put() run on the LLM worker thread while
+    load(), archive() and close() run on the UI thread, so shared state
+    is guarded by a lock.
+    """
+    def __init__(self, threshold: float = 0.85, path: str = CACHE_DB):
+        self.threshold = threshold
+        
+        # Optional embedding model; without it the cache is disabled. The
+        # first run downloads the model, which can fail for many reasons
+        # (offline, HTTP or disk errors) that must not stop the app
+        try:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(EMBEDDING_MODEL)
+        except ImportError:
+            self.model = None
+        except Exception as e:
+            print(f"Semantic cache disabled: {str(e)}")
+            self.model = None
+        
+        # Optional vector index; falls back to a NumPy dot product
+        try:
+            import faiss
+        except Exception:
+            faiss = None
+        self.faiss = faiss
+        self.lock = threading.Lock()
+        
+        # Kept per subject so a question never matches an answer given
+        # in a different context
+        self.indexes = {}
+        self.entries = {}
+        
+        # Answers and archived history rows are written to SQLite as they
+        # arrive, so nothing accumulates in memory or is lost on a crash
+        self.path = path
+        self.db = None
+        self.loaded_subjects = set()
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether an embedding model is available"""
+        return self.model is not None
+    
+    def get(self, question: str, subject: str, threshold: Optional[float] = None) -> Optional[str]:
+        """
+        Look up the answer to the most similar cached question
+        
+        Args:
+            question: The question text
+            subject: The subject the question was asked in
+            threshold: Minimum cosine similarity for a hit
+        
+        Returns:
+            The cached answer, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        with self.lock:
+            if not self.entries.get(subject):
+                return None
+        
+        if threshold is None:
+            threshold = self.threshold
+        
+        vector = self._embed(question)
+        with self.lock:
+            if self.faiss:
+                scores, ids = self.indexes[subject].search(vector, 1)
+                score, best = float(scores[0][0]), int(ids[0][0])
+            else:
+                similarities = self.indexes[subject] @ vector[0]
+                best = int(similarities.argmax())
+                score = float(similarities[best])
+            
+            if score < threshold:
+                return None
+            return self.entries[subject][best][1]
+    
+    def put(self, question: str, answer: str, subject: str):
+        """Store an answer for a question"""
+        if not self.enabled:
+            return
+        
+        vector = self._embed(question)
+        with self.lock:
+            self._add(question, answer, subject, vector)
+            db = self._connect()
+            db.execute(
+                "INSERT INTO answers (subject, question, answer, embedding) VALUES (?, ?, ?, ?)",
+                (subject, question, answer, vector.tobytes())
+            )
+            db.commit()
+    
+    def load(self, subject: str):
+        """Load the answers stored on disk for a subject"""
+        import numpy as np
+        
+        if not self.enabled:
+            return
+        
+        with self.lock:
+            if subject in self.loaded_subjects:
+                return
+            self.loaded_subjects.add(subject)
+            
+            rows = self._connect().execute(
+                "SELECT question, answer, embedding FROM answers "
+                "WHERE subject = ? AND embedding IS NOT NULL ORDER BY id",
+                (subject,)
+            ).fetchall()
+            
+            for question, answer, embedding in rows:
+                vector = np.frombuffer(embedding, dtype=np.float32).reshape(1, -1)
+                self._add(question, answer, subject, vector)
+    
+    def archive(self, question: str, answer: str, subject: str):
+        """Store a Q&A row that has scrolled out of the on-screen history"""
+        with self.lock:
+            db = self._connect()
+            db.execute(
+                "INSERT INTO qa_history (subject, question, answer) VALUES (?, ?, ?)",
+                (subject, question, answer)
+            )
+            db.commit()
+    
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use; callers hold the lock"""
+        if self.db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(self.path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "id INTEGER PRIMARY KEY, subject TEXT, question TEXT, answer TEXT, embedding BLOB)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS answers_subject ON answers (subject)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS qa_history ("
+                "id INTEGER PRIMARY KEY, subject TEXT, question TEXT, answer TEXT)"
+            )
+        return self.db
+    
+    def _add(self, question: str, answer: str, subject: str, vector):
+        """Add an embedded question to the subject's index; callers hold the lock"""
+        import numpy as np
+        
+        if self.faiss:
+            if subject not in self.indexes:
+                self.indexes[subject] = self.faiss.IndexFlatIP(vector.shape[1])
+            self.indexes[subject].add(vector)
+        elif subject in self.indexes:
+            self.indexes[subject] = np.vstack([self.indexes[subject], vector])
+        else:
+            self.indexes[subject] = vector
+        
+        self.entries.setdefault(subject, []).append((question, answer))
+    
+    def _embed(self, text: str):
+        """Embed text as a normalized float32 row vector, so inner product is cosine"""
+        import numpy as np
+        
+        vector = self.model.encode([text.strip()], normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
@@ -4,6 +4,31 @@ Setup script for Audio Q&A Assistant
 import os
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+def install_requirements():
+    """Install packages from requirements.txt"""
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        return ["✓ Requirements installed successfully"]
+    except subprocess.CalledProcessError:
+        return [
+            "✗ Failed to install requirements",
+            "  Please install manually: pip install -r requirements.txt"
+        ]
+
+def create_directories():
+    """Create the directory structure and package files"""
+    directories = ["audio", "ai", "ui", "logs", "cache"]
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    
+    # Create __init__.py files
+    for directory in ["audio", "ai", "ui"]:
+        Path(directory, "__init__.py").touch(exist_ok=True)
+    
+    return ["✓ Directories created", "✓ Package files created"]
 
 def setup_environment():
     """Set up the development environment"""
@@ -15,31 +40,16 @@ def setup_environment():
         print("Error: Python 3.8 or higher is required")
         sys.exit(1)
     
-    # Install requirements
-    print("\n1. Installing requirements...")
-    try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-        print("✓ Requirements installed successfully")
-    except subprocess.CalledProcessError:
-        print("✗ Failed to install requirements")
-        print("  Please install manually: pip install -r requirements.txt")
-    
-    # Create necessary directories
-    print("\n2. Creating directory structure...")
-    directories = ["audio", "ai", "ui", "logs", "cache"]
-    for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-    print("✓ Directories created")
-    
-    # Create __init__.py files
-    for directory in ["audio", "ai", "ui"]:
-        init_file = os.path.join(directory, "__init__.py")
-        if not os.path.exists(init_file):
-            open(init_file, 'a').close()
-    print("✓ Package files created")
+    # Install requirements and create directories concurrently
+    print("\n1. Installing requirements and creating directory structure...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(install_requirements), executor.submit(create_directories)]
+        for future in as_completed(futures):
+            for line in future.result():
+                print(line)
     
     # Check for API key
-    print("\n3. Checking OpenAI API configuration...")
+    print("\n2. Checking OpenAI API configuration...")
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("⚠ Warning: OPENAI_API_KEY not found in environment variables")
@@ -51,8 +61,8 @@ def setup_environment():
     else:
         print("✓ OpenAI API key found")
     
-    # Test audio
-    print("\n4. Testing audio configuration...")
+    # Test audio (after installing, since pip may be what provides pyaudio)
+    print("\n3. Testing audio configuration...")
     try:
         import pyaudio
         p = pyaudio.PyAudio()
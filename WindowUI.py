@@ -1,17 +1,139 @@
 """
 Main window UI for the Audio Q&A Assistant
 """
+import html
+from collections import deque
+from functools import lru_cache
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTextEdit, QLabel, QGroupBox,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QPushButton, QPlainTextEdit, QLabel, QGroupBox,
     QDialog, QListWidget, QDialogButtonBox, QMessageBox,
-    QFrame, QScrollArea
+    QFrame, QListView, QAbstractItemView, QStyledItemDelegate,
+    QStyle, QStyleOptionButton
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, pyqtSlot
-from PyQt6.QtGui import QFont, QPalette, QColor
+from PyQt6.QtCore import (
+    Qt, QObject, QThread, QTimer, QAbstractListModel, QModelIndex,
+    QEvent, QRect, QSize, pyqtSignal, pyqtSlot
+)
+from PyQt6.QtGui import QFont, QPalette, QColor, QPainter, QTextDocument
 from audio.audio_handler import AudioHandler
 from ai.llm_handler import LLMHandler
 from ai.question_detector import QuestionDetector
+from ai.semantic_cache import SemanticCache
+
+@lru_cache(maxsize=None)
+def shared_font(family: str, size: int, bold: bool = False) -> QFont:
+    """Build each font once; QFont is implicitly shared, so setFont copies cheaply"""
+    if bold:
+        return QFont(family, size, QFont.Weight.Bold)
+    return QFont(family, size)
+
+@lru_cache(maxsize=256)
+def _is_question_cached(detector: QuestionDetector, text: str) -> bool:
+    """Memoized detector call; speech recognition often repeats the same line"""
+    return detector.is_question(text)
+
+# Application-wide stylesheet, applied once on the QApplication; widgets
+# are targeted by object name
+APP_STYLESHEET = """
+QMainWindow {
+    background-color: #f5f5f5;
+}
+QGroupBox {
+    font-size: 14px;
+    font-weight: bold;
+    border: 2px solid #cccccc;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding-top: 10px;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+}
+QPushButton#listenButton {
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 5px;
+}
+QPushButton#listenButton:hover {
+    background-color: #45a049;
+}
+QPushButton#listenButton:checked {
+    background-color: #f44336;
+}
+QPushButton#listenButton:checked:hover {
+    background-color: #da190b;
+}
+QPushButton#visualizeButton {
+    background-color: #2196F3;
+    color: white;
+    border-radius: 5px;
+}
+QPushButton#visualizeButton:hover {
+    background-color: #0b7dda;
+}
+QPushButton#visualizeButton:checked {
+    background-color: #ff9800;
+}
+QPushButton#visualizeButton:checked:hover {
+    background-color: #e68900;
+}
+QLabel#statusLabel {
+    background-color: #f0f0f0;
+    padding: 5px;
+    border-radius: 3px;
+}
+QFrame#answerNotification {
+    background-color: #fff3cd;
+    border: 2px solid #ffeaa7;
+    border-radius: 5px;
+    padding: 10px;
+}
+QPushButton#answerButton {
+    background-color: #28a745;
+    color: white;
+    padding: 10px 20px;
+    border-radius: 5px;
+}
+QPushButton#answerButton:hover {
+    background-color: #218838;
+}
+QPushButton#answerButton:disabled {
+    background-color: #94d3a2;
+}
+QPushButton#ignoreButton {
+    background-color: #dc3545;
+    color: white;
+    padding: 10px 20px;
+    border-radius: 5px;
+}
+QPushButton#ignoreButton:hover {
+    background-color: #c82333;
+}
+"""
+
+# Q&A rows are painted by QADelegate rather than styled widgets
+QA_HTML = (
+    "<b>Question:</b>"
+    "<div style='margin-left: 10px; white-space: pre-wrap;'>{question}</div>"
+    "<b>Answer:</b>"
+    "<div style='margin-left: 10px; white-space: pre-wrap;'>{answer}</div>"
+)
+
+SUBJECTS = (
+    "Mathematics",
+    "Physics",
+    "Chemistry",
+    "Biology",
+    "Computer Science",
+    "History",
+    "English Literature",
+    "Geography",
+    "Economics",
+    "Psychology"
+)
 
 class SubjectSelectionDialog(QDialog):
     """Dialog for selecting the subject at startup"""
@@ -33,20 +155,8 @@ class SubjectSelectionDialog(QDialog):
         
         # Subject list
         self.subject_list = QListWidget()
-        self.subject_list.setFont(QFont("Arial", 11))
-        subjects = [
-            "Mathematics",
-            "Physics",
-            "Chemistry",
-            "Biology",
-            "Computer Science",
-            "History",
-            "English Literature",
-            "Geography",
-            "Economics",
-            "Psychology"
-        ]
-        self.subject_list.addItems(subjects)
+        self.subject_list.setFont(shared_font("Arial", 11))
+        self.subject_list.addItems(SUBJECTS)
         self.subject_list.setCurrentRow(0)
         layout.addWidget(self.subject_list)
         
@@ -65,6 +175,171 @@ class SubjectSelectionDialog(QDialog):
         current_item = self.subject_list.currentItem()
         return current_item.text() if current_item else "General"
 
+class QAModel(QAbstractListModel):
+    """List model holding the most recent (question, answer) history"""
+    QARole = Qt.ItemDataRole.UserRole
+    MAX_ROWS = 1000
+    
+    # Question and answer of the oldest row, dropped to make room
+    row_evicted = pyqtSignal(str, str)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = deque(maxlen=self.MAX_ROWS)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == self.QARole:
+            return self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][0]
+        return None
+    
+    def append(self, row):
+        """Add a (question, answer) row at the end, evicting the oldest when full"""
+        if len(self._rows) == self.MAX_ROWS:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            evicted = self._rows.popleft()
+            self.endRemoveRows()
+            self.row_evicted.emit(*evicted)
+        
+        position = len(self._rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.append(row)
+        self.endInsertRows()
+    
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or count <= 0 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        for _ in range(count):
+            del self._rows[row]
+        self.endRemoveRows()
+        return True
+
+class QADelegate(QStyledItemDelegate):
+    """Paints a Q&A row as a card with an OK button that dismisses it"""
+    MARGIN = 5
+    PADDING = 10
+    BUTTON_WIDTH = 100
+    BUTTON_HEIGHT = 28
+    
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._model = model
+        
+        # Row heights depend only on the row and the view width; QListView
+        # asks for every row's size on each relayout, so keep them
+        self._sizes = {}
+        self._sizes_width = None
+        model.rowsAboutToBeRemoved.connect(self._forget_rows)
+        model.modelReset.connect(self._sizes.clear)
+        
+        # Reused for every row; paint and sizeHint only ever run on the UI
+        # thread, one row at a time
+        self._doc = QTextDocument(self)
+        self._doc.setDefaultFont(shared_font("Arial", 10))
+        self._button = QStyleOptionButton()
+        self._button.text = "OK"
+        self._button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+    
+    def document(self, row, width):
+        """Lay out the question and answer text for a card of the given width"""
+        question, answer = row
+        self._doc.setHtml(QA_HTML.format(question=html.escape(question), answer=html.escape(answer)))
+        self._doc.setTextWidth(max(width - 2 * self.PADDING, 1))
+        return self._doc
+    
+    def card_rect(self, rect):
+        """Area of the card within the row"""
+        return rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+    
+    def button_rect(self, card):
+        """Area of the OK button within the card"""
+        return QRect(
+            card.right() - self.PADDING - self.BUTTON_WIDTH,
+            card.bottom() - self.PADDING - self.BUTTON_HEIGHT,
+            self.BUTTON_WIDTH,
+            self.BUTTON_HEIGHT
+        )
+    
+    def paint(self, painter, option, index):
+        card = self.card_rect(option.rect)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QColor("#ddd"))
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(card, 5, 5)
+        
+        doc = self.document(index.data(QAModel.QARole), card.width())
+        painter.translate(card.left() + self.PADDING, card.top() + self.PADDING)
+        doc.drawContents(painter)
+        painter.restore()
+        
+        # OK button
+        self._button.rect = self.button_rect(card)
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, self._button, painter, option.widget)
+    
+    def sizeHint(self, option, index):
+        width = option.widget.viewport().width() if option.widget else 400
+        if width != self._sizes_width:
+            self._sizes.clear()
+            self._sizes_width = width
+        
+        row = index.data(QAModel.QARole)
+        size = self._sizes.get(row)
+        if size is None:
+            doc = self.document(row, width - 2 * self.MARGIN)
+            height = doc.size().height() + 3 * self.PADDING + self.BUTTON_HEIGHT + 2 * self.MARGIN
+            size = self._sizes[row] = QSize(width, int(height))
+        return size
+    
+    def _forget_rows(self, parent, first, last):
+        """Drop cached sizes for rows leaving the model"""
+        for position in range(first, last + 1):
+            self._sizes.pop(self._model.data(self._model.index(position), QAModel.QARole), None)
+    
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and self.button_rect(self.card_rect(option.rect)).contains(event.position().toPoint())):
+            model.removeRow(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+class HandlerLoader(QObject):
+    """Builds the handlers on a worker thread so the window can paint first"""
+    loaded = pyqtSignal(object, object, object)
+    cache_loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    
+    @pyqtSlot()
+    def run(self):
+        """Construct the handlers and pass them back to the window"""
+        try:
+            audio_handler = AudioHandler()
+            llm_handler = LLMHandler()
+            question_detector = QuestionDetector()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        
+        # Hand the handlers to the UI thread; signals they forward would
+        # otherwise be queued to this thread after it has quit
+        ui_thread = QApplication.instance().thread()
+        audio_handler.moveToThread(ui_thread)
+        llm_handler.moveToThread(ui_thread)
+        self.loaded.emit(audio_handler, llm_handler, question_detector)
+        
+        # The optional semantic cache comes last so loading its embedding
+        # model does not hold up listening
+        self.cache_loaded.emit(SemanticCache())
+
 class MainWindow(QMainWindow):
     """Main application window"""
     def __init__(self):
@@ -74,21 +349,78 @@ class MainWindow(QMainWindow):
         self.current_answer = None
         self.is_listening = False
         
-        # Initialize handlers
-        self.audio_handler = AudioHandler()
-        self.llm_handler = LLMHandler()
-        self.question_detector = QuestionDetector()
+        # Transcriptions are buffered and flushed to the UI at most every 100 ms
+        self._trans_buffer = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(100)
+        self._flush_timer.timeout.connect(self._flush_transcription)
         
-        # Connect signals
-        self.audio_handler.transcription_ready.connect(self.on_transcription)
-        self.llm_handler.answer_ready.connect(self.on_answer_ready)
+        # Handlers are created by HandlerLoader in the background
+        self.audio_handler = None
+        self.llm_handler = None
+        self.question_detector = None
+        self.semantic_cache = None
         
         # Setup UI
         self.setup_ui()
+        self.listen_button.setEnabled(False)
+        self.visualize_button.setEnabled(False)
+        self.status_label.setText("Status: Loading...")
+        
+        # Initialize handlers off the UI thread
+        self._loader_thread = QThread()
+        self._loader = HandlerLoader()
+        self._loader.moveToThread(self._loader_thread)
+        self._loader_thread.started.connect(self._loader.run)
+        self._loader.loaded.connect(self._on_handlers_ready)
+        self._loader.cache_loaded.connect(self._on_cache_ready)
+        self._loader.failed.connect(self._on_load_failed)
+        self._loader_thread.start()
         
         # Show subject selection dialog
         self.show_subject_dialog()
     
+    @pyqtSlot(object, object, object)
+    def _on_handlers_ready(self, audio_handler, llm_handler, question_detector):
+        """Wire up the handlers once HandlerLoader has built them"""
+        self.audio_handler = audio_handler
+        self.llm_handler = llm_handler
+        self.question_detector = question_detector
+        
+        # Connect signals; queued so audio and LLM threads never run UI code
+        queued = Qt.ConnectionType.QueuedConnection
+        self.audio_handler.transcription_ready.connect(self.on_transcription, queued)
+        self.audio_handler.error_occurred.connect(self.on_audio_error, queued)
+        self.audio_handler.listening_failed.connect(self.on_listening_failed, queued)
+        self.llm_handler.answer_ready.connect(self.on_answer_ready, queued)
+        self.llm_handler.answer_complete.connect(self.on_answer_complete, queued)
+        self.llm_handler.answer_failed.connect(self.on_answer_failed, queued)
+        
+        if self.selected_subject:
+            self.llm_handler.set_subject(self.selected_subject)
+        
+        self.listen_button.setEnabled(True)
+        self.visualize_button.setEnabled(True)
+        self.status_label.setText("Status: Ready")
+    
+    @pyqtSlot(object)
+    def _on_cache_ready(self, semantic_cache):
+        """Start using the semantic cache once its model has loaded"""
+        self.semantic_cache = semantic_cache
+        self._loader_thread.quit()
+        
+        self.llm_handler.set_semantic_cache(semantic_cache)
+        if self.selected_subject:
+            self.semantic_cache.load(self.selected_subject)
+    
+    @pyqtSlot(str)
+    def _on_load_failed(self, message):
+        """Report handlers that could not be created"""
+        self._loader_thread.quit()
+        self.status_label.setText("Status: Could not start audio or AI")
+        QMessageBox.critical(self, "Startup Error", f"Could not initialize the assistant:\n{message}")
+    
     def setup_ui(self):
         """Setup the user interface"""
         self.setWindowTitle("Audio Q&A Assistant")
@@ -106,13 +438,12 @@ class MainWindow(QMainWindow):
         # Header
         header = QLabel("Audio Q&A Assistant")
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        header_font = QFont("Arial", 20, QFont.Weight.Bold)
-        header.setFont(header_font)
+        header.setFont(shared_font("Arial", 20, bold=True))
         main_layout.addWidget(header)
         
         # Subject label
         self.subject_label = QLabel("Subject: Not Selected")
-        self.subject_label.setFont(QFont("Arial", 12))
+        self.subject_label.setFont(shared_font("Arial", 12))
         self.subject_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         main_layout.addWidget(self.subject_label)
         
@@ -122,48 +453,18 @@ class MainWindow(QMainWindow):
         
         self.listen_button = QPushButton("Start Listening")
         self.listen_button.setCheckable(True)
-        self.listen_button.setFont(QFont("Arial", 12))
+        self.listen_button.setFont(shared_font("Arial", 12))
         self.listen_button.setMinimumHeight(50)
         self.listen_button.clicked.connect(self.toggle_listening)
-        self.listen_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:checked {
-                background-color: #f44336;
-            }
-            QPushButton:checked:hover {
-                background-color: #da190b;
-            }
-        """)
+        self.listen_button.setObjectName("listenButton")
         control_layout.addWidget(self.listen_button)
         
         self.visualize_button = QPushButton("Visualize")
         self.visualize_button.setCheckable(True)
-        self.visualize_button.setFont(QFont("Arial", 12))
+        self.visualize_button.setFont(shared_font("Arial", 12))
         self.visualize_button.setMinimumHeight(50)
         self.visualize_button.clicked.connect(self.toggle_visualization)
-        self.visualize_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #0b7dda;
-            }
-            QPushButton:checked {
-                background-color: #ff9800;
-            }
-            QPushButton:checked:hover {
-                background-color: #e68900;
-            }
-        """)
+        self.visualize_button.setObjectName("visualizeButton")
         control_layout.addWidget(self.visualize_button)
         
         control_group.setLayout(control_layout)
@@ -171,24 +472,20 @@ class MainWindow(QMainWindow):
         
         # Status label
         self.status_label = QLabel("Status: Ready")
-        self.status_label.setFont(QFont("Arial", 10))
+        self.status_label.setFont(shared_font("Arial", 10))
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.status_label.setStyleSheet("""
-            QLabel {
-                background-color: #f0f0f0;
-                padding: 5px;
-                border-radius: 3px;
-            }
-        """)
+        self.status_label.setObjectName("statusLabel")
         main_layout.addWidget(self.status_label)
         
         # Transcription area
         trans_group = QGroupBox("Live Transcription")
         trans_layout = QVBoxLayout()
         
-        self.transcription_area = QTextEdit()
+        # Plain-text log capped at 500 lines; oldest lines are dropped
+        self.transcription_area = QPlainTextEdit()
         self.transcription_area.setReadOnly(True)
-        self.transcription_area.setFont(QFont("Consolas", 10))
+        self.transcription_area.setMaximumBlockCount(500)
+        self.transcription_area.setFont(shared_font("Consolas", 10))
         self.transcription_area.setMaximumHeight(150)
         trans_layout.addWidget(self.transcription_area)
         
@@ -203,89 +500,55 @@ class MainWindow(QMainWindow):
         self.answer_notification = QFrame()
         self.answer_notification.setVisible(False)
         self.answer_notification.setFrameStyle(QFrame.Shape.Box)
-        self.answer_notification.setStyleSheet("""
-            QFrame {
-                background-color: #fff3cd;
-                border: 2px solid #ffeaa7;
-                border-radius: 5px;
-                padding: 10px;
-            }
-        """)
+        self.answer_notification.setObjectName("answerNotification")
         
-        notif_layout = QHBoxLayout(self.answer_notification)
+        notif_outer = QVBoxLayout(self.answer_notification)
+        notif_layout = QHBoxLayout()
+        notif_outer.addLayout(notif_layout)
         
-        notif_label = QLabel("New answer available!")
-        notif_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        notif_layout.addWidget(notif_label)
+        self.notification_label = QLabel("New answer available!")
+        self.notification_label.setFont(shared_font("Arial", 12, bold=True))
+        notif_layout.addWidget(self.notification_label)
         
         notif_layout.addStretch()
         
         self.answer_button = QPushButton("ANSWER")
-        self.answer_button.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        self.answer_button.setFont(shared_font("Arial", 12, bold=True))
         self.answer_button.clicked.connect(self.show_answer)
-        self.answer_button.setStyleSheet("""
-            QPushButton {
-                background-color: #28a745;
-                color: white;
-                padding: 10px 20px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-        """)
+        self.answer_button.setObjectName("answerButton")
         notif_layout.addWidget(self.answer_button)
         
         self.ignore_button = QPushButton("Ignore")
-        self.ignore_button.setFont(QFont("Arial", 12))
+        self.ignore_button.setFont(shared_font("Arial", 12))
         self.ignore_button.clicked.connect(self.ignore_question)
-        self.ignore_button.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                padding: 10px 20px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-        """)
+        self.ignore_button.setObjectName("ignoreButton")
         notif_layout.addWidget(self.ignore_button)
         
+        # Answer text as it streams in
+        self.answer_preview = QLabel()
+        self.answer_preview.setTextFormat(Qt.TextFormat.PlainText)
+        self.answer_preview.setWordWrap(True)
+        self.answer_preview.setFont(shared_font("Arial", 10))
+        self.answer_preview.setMaximumHeight(100)
+        notif_outer.addWidget(self.answer_preview)
+        
         qa_layout.addWidget(self.answer_notification)
         
-        # Q&A display area
-        self.qa_display = QScrollArea()
-        self.qa_content = QWidget()
-        self.qa_content_layout = QVBoxLayout(self.qa_content)
-        self.qa_content_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.qa_display.setWidget(self.qa_content)
-        self.qa_display.setWidgetResizable(True)
+        # Q&A display area; rows are painted on demand, so only visible
+        # entries cost anything regardless of history length
+        self._qa_model = QAModel(self)
+        self.qa_display = QListView()
+        self.qa_display.setModel(self._qa_model)
+        self._qa_model.row_evicted.connect(self._archive_row)
+        self.qa_display.setItemDelegate(QADelegate(self._qa_model, self.qa_display))
+        self.qa_display.setResizeMode(QListView.ResizeMode.Adjust)
+        self.qa_display.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.qa_display.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
         self.qa_display.setMinimumHeight(200)
         qa_layout.addWidget(self.qa_display)
         
         qa_group.setLayout(qa_layout)
         main_layout.addWidget(qa_group)
-        
-        # Apply dark theme
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-            }
-            QGroupBox {
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid #cccccc;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
     
     def show_subject_dialog(self):
         """Show subject selection dialog"""
@@ -293,7 +556,10 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.selected_subject = dialog.get_selected_subject()
             self.subject_label.setText(f"Subject: {self.selected_subject}")
-            self.llm_handler.set_subject(self.selected_subject)
+            if self.llm_handler:
+                self.llm_handler.set_subject(self.selected_subject)
+            if self.semantic_cache:
+                self.semantic_cache.load(self.selected_subject)
         else:
             # If cancelled, exit application
             QMessageBox.warning(self, "No Subject Selected", 
@@ -329,28 +595,93 @@ class MainWindow(QMainWindow):
     @pyqtSlot(str)
     def on_transcription(self, text):
         """Handle new transcription"""
-        self.transcription_area.append(text)
-        
-        # Check if it's a question
-        if self.is_listening and self.question_detector.is_question(text):
+        self._trans_buffer.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    @pyqtSlot(str)
+    def on_audio_error(self, message):
+        """Show an audio error without interrupting listening"""
+        self.status_label.setText(f"Status: {message}")
+    
+    @pyqtSlot(str)
+    def on_listening_failed(self, message):
+        """Reset the listen button when the listener could not start"""
+        self.listen_button.setChecked(False)
+        self.listen_button.setText("Start Listening")
+        self.is_listening = False
+        self.status_label.setText(f"Status: {message}")
+    
+    @pyqtSlot()
+    def _flush_transcription(self):
+        """Show buffered transcriptions and check them for a question"""
+        if not self._trans_buffer:
+            return
+        
+        self.transcription_area.blockSignals(True)
+        self.transcription_area.appendPlainText("\n".join(self._trans_buffer))
+        self.transcription_area.blockSignals(False)
+        
+        text = " ".join(self._trans_buffer)
+        self._trans_buffer.clear()
+        
+        # Check if it's a question; a trailing '?' settles it without the
+        # detector, which itself rejects most other lines on the first character
+        if self.is_listening and (text.rstrip().endswith('?')
+                                  or _is_question_cached(self.question_detector, text.strip().lower())):
             self.current_question = text
+            self.current_answer = None
+            self.answer_notification.setVisible(False)
             self.status_label.setText("Status: Processing question...")
             self.llm_handler.get_answer(text)
     
-    @pyqtSlot(str)
-    def on_answer_ready(self, answer):
-        """Handle answer from LLM"""
+    @pyqtSlot(str, str)
+    def on_answer_ready(self, question, chunk):
+        """Handle a streamed chunk of the answer from LLM"""
+        # The worker answers one question at a time; drop chunks for a
+        # question that has since been replaced
+        if question != self.current_question:
+            return
+        
+        first_chunk = self.current_answer is None
+        self.current_answer = (self.current_answer or "") + chunk
+        self.answer_preview.setText(self.current_answer)
+        
+        # Show the answer from its first words rather than when it completes
+        if first_chunk:
+            self.notification_label.setText("Answer incoming...")
+            self.answer_button.setEnabled(False)
+            self.answer_notification.setVisible(True)
+            self.status_label.setText("Status: Receiving answer...")
+    
+    @pyqtSlot(str, str)
+    def on_answer_complete(self, question, answer):
+        """Handle the end of the answer stream"""
+        if question != self.current_question:
+            return
         self.current_answer = answer
+        self.answer_preview.setText(answer)
+        self.notification_label.setText("New answer available!")
+        self.answer_button.setEnabled(True)
         self.answer_notification.setVisible(True)
         self.status_label.setText("Status: Answer ready!")
     
+    @pyqtSlot(str, str)
+    def on_answer_failed(self, question, message):
+        """Drop a partial answer whose stream failed and show the error"""
+        if question != self.current_question:
+            return
+        self.current_question = None
+        self.current_answer = None
+        self.answer_button.setEnabled(True)
+        self.answer_notification.setVisible(False)
+        self.status_label.setText(f"Status: {message}")
+    
     @pyqtSlot()
     def show_answer(self):
         """Display the current Q&A"""
         if self.current_question and self.current_answer:
-            # Create Q&A widget
-            qa_widget = self.create_qa_widget(self.current_question, self.current_answer)
-            self.qa_content_layout.addWidget(qa_widget)
+            self._qa_model.append((self.current_question, self.current_answer))
             
             # Clear current Q&A
             self.current_question = None
@@ -358,6 +689,13 @@ class MainWindow(QMainWindow):
             self.answer_notification.setVisible(False)
             self.status_label.setText("Status: Listening...")
     
+    @pyqtSlot(str, str)
+    def _archive_row(self, question, answer):
+        """Keep a Q&A row dropped from the history recoverable on disk"""
+        if self.semantic_cache:
+            self.semantic_cache.archive(question, answer, subject=self.selected_subject)
+            self.qa_display.setToolTip("Older answers are archived to disk")
+    
     @pyqtSlot()
     def ignore_question(self):
         """Ignore the current question"""
@@ -366,53 +704,16 @@ class MainWindow(QMainWindow):
         self.answer_notification.setVisible(False)
         self.status_label.setText("Status: Listening...")
     
-    def create_qa_widget(self, question, answer):
-        """Create a widget for displaying Q&A"""
-        widget = QFrame()
-        widget.setFrameStyle(QFrame.Shape.Box)
-        widget.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                padding: 10px;
-                margin: 5px;
-            }
-        """)
-        
-        layout = QVBoxLayout(widget)
-        
-        # Question
-        q_label = QLabel("Question:")
-        q_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-        layout.addWidget(q_label)
-        
-        q_text = QLabel(question)
-        q_text.setWordWrap(True)
-        q_text.setFont(QFont("Arial", 10))
-        q_text.setStyleSheet("padding-left: 10px;")
-        layout.addWidget(q_text)
-        
-        # Answer
-        a_label = QLabel("Answer:")
-        a_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-        layout.addWidget(a_label)
-        
-        a_text = QLabel(answer)
-        a_text.setWordWrap(True)
-        a_text.setFont(QFont("Arial", 10))
-        a_text.setStyleSheet("padding-left: 10px;")
-        layout.addWidget(a_text)
-        
-        # OK button
-        ok_button = QPushButton("OK")
-        ok_button.clicked.connect(lambda: widget.deleteLater())
-        ok_button.setMaximumWidth(100)
-        layout.addWidget(ok_button, alignment=Qt.AlignmentFlag.AlignRight)
-        
-        return widget
-    
     def closeEvent(self, event):
         """Clean up when closing"""
-        self.audio_handler.stop_listening()
+        self._loader_thread.quit()
+        self._loader_thread.wait()
+        if self.audio_handler:
+            # Hide first; the listeners exit once the speaker pauses
+            self.hide()
+            self.audio_handler.shutdown()
+        if self.llm_handler:
+            self.llm_handler.stop()
+        if self.semantic_cache:
+            self.semantic_cache.close()
         event.accept()